@@ -8,186 +8,213 @@ support for PyOpenColorIO and the existing cleanup functionality.
 from __future__ import absolute_import, annotations, division, print_function
 
 import argparse
+import ast
+import filecmp
+import functools
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import multiprocessing
 import os
 import pathlib
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
-
-import mypy.stubgen
-import mypy.stubgenc
-from mypy.stubgenc import DocstringSignatureGenerator, SignatureGenerator
-from stubgenlib.siggen import AdvancedSigMatcher, AdvancedSignatureGenerator
-from stubgenlib.utils import add_positional_only_args
-
-PY_TO_STDVECTOR_ARG = "float | typing.Iterable[float]"
-
-
-class OIIOSignatureGenerator(AdvancedSignatureGenerator):
-    """Signature generator specifically for OpenImageIO."""
-
-    sig_matcher = AdvancedSigMatcher(
-        signature_overrides={
-            # signatures for these special methods include many inaccurate overloads
-            "*.__ne__": "(self, other: object) -> bool",
-            "*.__eq__": "(self, other: object) -> bool",
-        },
-        arg_type_overrides={
-            # FIXME: Buffer may in fact be more accurate here
-            ("*", "*", "Buffer"): "numpy.ndarray",
-            # these use py_to_stdvector util
-            ("*.ImageBufAlgo.*", "min", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "max", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "black", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "white", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "sthresh", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "scontrast", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "white_balance", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "values", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "top", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "bottom", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "topleft", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "topright", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "bottomleft", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "bottomright", "object"): PY_TO_STDVECTOR_ARG,
-            ("*.ImageBufAlgo.*", "color", "object"): PY_TO_STDVECTOR_ARG,
-            # BASETYPE & str are implicitly converible to TypeDesc
-            ("*", "*", "*.TypeDesc"): "Union[TypeDesc, BASETYPE, str]",
-            # list is not strictly required
-            (
-                "*.ImageOutput.open",
-                "specs",
-                "list[ImageSpec]",
-            ): "typing.Iterable[ImageSpec]",
-        },
-        result_type_overrides={
-            # FIXME: is there a way to use std::optional for these?
-            ("*.ImageOutput.create", "object"): "ImageOutput | None",
-            ("*.ImageOutput.open", "object"): "ImageOutput | None",
-            ("*.ImageInput.create", "object"): "ImageInput | None",
-            ("*.ImageInput.open", "object"): "ImageInput | None",
-            # if you return an uninitialized unique_ptr to pybind11 it will convert to `None`
-            ("*.ImageInput.read_native_deep_*", "DeepData"): "DeepData | None",
-            # pybind11 has numpy support
-            ("*.ImageInput.read_*", "object"): "numpy.ndarray | None",
-            ("*", "Buffer"): "numpy.ndarray",
-            ("*.get_pixels", "object"): "numpy.ndarray | None",
-            # For results, `object` is too restrictive
-            ("*.getattribute", "object"): "typing.Any",
-            ("*.ImageSpec.get", "object"): "typing.Any",
-            ("*.ImageBufAlgo.histogram", "*"): "tuple[int, ...]",
-            ("*.ImageBufAlgo.isConstantColor", "*"): "tuple[float, ...] | None",
-            ("*.ImageBufAlgo.color_range_check", "*"): "tuple[int, ...] | None",
-            ("*.TextureSystem.imagespec", "object"): "ImageSpec | None",
-            ("*.TextureSystem.texture", "tuple"): "tuple[float, ...]",
-            ("*.TextureSystem.texture3d", "tuple"): "tuple[float, ...]",
-            ("*.TextureSystem.environment", "tuple"): "tuple[float, ...]",
-            ("*.ImageBuf.getpixel", "tuple"): "tuple[float, ...]",
-            ("*.ImageBuf.interppixel*", "tuple"): "tuple[float, ...]",
-            ("*.ImageSpec.get_channelformats", "tuple"): "tuple[TypeDesc, ...]",
-        },
-        property_type_overrides={
-            ("*.ParamValue.value", "object"): "typing.Any",
-        },
-    )
+from typing import Iterable, Iterator, Optional
 
-    def process_sig(
-        self, ctx: mypy.stubgen.FunctionContext, sig: mypy.stubgen.FunctionSig
-    ) -> mypy.stubgen.FunctionSig:
-        """Process signature with OIIO-specific handling."""
-        return add_positional_only_args(ctx, super().process_sig(ctx, sig))
-
-
-class OCIOSignatureGenerator(AdvancedSignatureGenerator):
-    """Signature generator specifically for PyOpenColorIO."""
-
-    sig_matcher = AdvancedSigMatcher(
-        signature_overrides={
-            # Special methods
-            "*.__ne__": "(self, other: object) -> bool",
-            "*.__eq__": "(self, other: object) -> bool",
-        },
-        arg_type_overrides={
-            # Add PyOpenColorIO-specific type overrides here as needed
-        },
-        result_type_overrides={
-            # Add PyOpenColorIO-specific result type overrides here as needed
-        },
-    )
+# Line prefixes of top-level import statements
+IMPORT_PREFIXES = ("import ", "from ")
 
-    def process_sig(
-        self, ctx: mypy.stubgen.FunctionContext, sig: mypy.stubgen.FunctionSig
-    ) -> mypy.stubgen.FunctionSig:
-        """Process signature with OCIO-specific handling."""
-        return add_positional_only_args(ctx, super().process_sig(ctx, sig))
-
-
-class CustomInspectionStubGenerator(mypy.stubgenc.InspectionStubGenerator):
-    """Custom stub generator that uses our signature generators."""
-
-    module_name: str = ""
-
-    def get_sig_generators(self) -> list[SignatureGenerator]:
-        if "OpenImageIO" in self.module_name:
-            return [
-                OIIOSignatureGenerator(
-                    fallback_sig_gen=DocstringSignatureGenerator(),
-                )
-            ]
-        elif "PyOpenColorIO" in self.module_name:
-            return [
-                OCIOSignatureGenerator(
-                    fallback_sig_gen=DocstringSignatureGenerator(),
-                )
-            ]
-        else:
-            return [DocstringSignatureGenerator()]
+# Annotations implicitly accepted by a wider one, used to drop redundant overloads.
+# Members of a union (e.g. BASETYPE in `TypeDesc | BASETYPE | str`) are handled too.
+OVERLOAD_SUBTYPES = {
+    "int": "float",
+}
 
 
-def fix_pyopencolorio_exceptions(content: str) -> str:
+def fix_pyopencolorio_exceptions(lines: Iterable[str]) -> Iterator[str]:
     """
     Fix the cyclic Exception definition in PyOpenColorIO stubs.
 
     PyOpenColorIO defines its own Exception class that inherits from Exception,
     creating a cyclic definition. We need to alias the built-in Exception.
     """
-    lines = content.split("\n")
-    fixed_lines = []
-
     # Add import for built-in exceptions at the top (after other imports)
     import_added = False
+    # Set on the line following an import, where the builtins import may go
+    after_import = False
 
-    for i, line in enumerate(lines):
-        # Add the import after the first import/from statement
-        if not import_added and (
-            line.startswith("import ") or line.startswith("from ")
-        ):
-            fixed_lines.append(line)
+    for line in lines:
+        if after_import:
+            after_import = False
             # Check if we haven't already added this import
-            if i + 1 < len(lines) and "builtins" not in lines[i + 1]:
-                fixed_lines.append(
-                    "from builtins import Exception as _BuiltinException"
-                )
+            if "builtins" not in line:
+                yield "from builtins import Exception as _BuiltinException\n"
                 import_added = True
+
+        # Add the import after the first import/from statement
+        if not import_added and line.startswith(IMPORT_PREFIXES):
+            after_import = True
+            yield line
             continue
 
         # Replace Exception inheritance with _BuiltinException
-        if "class Exception(Exception):" in line:
-            fixed_lines.append("class Exception(_BuiltinException): ...")
-        elif (
-            line.startswith("class ")
-            and "(Exception)" in line
-            and "class Exception" not in line
-        ):
-            # Other exception classes inheriting from the custom Exception are fine
-            fixed_lines.append(line)
+        # stubgen emits this top-level class verbatim, no need to scan the line
+        if line.startswith("class Exception(Exception):"):
+            yield "class Exception(_BuiltinException): ...\n"
+        else:
+            yield line
+
+
+def add_buffer_import(lines: Iterable[str]) -> Iterator[str]:
+    """Insert the typing_extensions Buffer import after the leading imports."""
+    buffer_import = "from typing_extensions import Buffer\n"
+    import_seen = False
+    inserted = False
+    # Lines held back until we know the import block has ended
+    pending: list[str] = []
+
+    for line in lines:
+        if inserted:
+            yield line
+        elif line.startswith(IMPORT_PREFIXES):
+            import_seen = True
+            yield from pending
+            pending.clear()
+            yield line
+        elif import_seen and line.rstrip("\n") and not line.startswith(" "):
+            yield buffer_import
+            inserted = True
+            yield from pending
+            pending.clear()
+            yield line
         else:
-            fixed_lines.append(line)
+            pending.append(line)
 
-    return "\n".join(fixed_lines)
+    if not inserted:
+        yield buffer_import
+        yield from pending
 
 
-def fix_overload_conflicts(content: str) -> str:
+def _is_overload(node: ast.FunctionDef) -> bool:
+    """Return True if ``node`` is decorated with ``@overload``."""
+    return any(_is_overload_decorator(decorator) for decorator in node.decorator_list)
+
+
+def _is_overload_decorator(decorator: ast.expr) -> bool:
+    """Return True if ``decorator`` is ``@overload`` or ``@typing.overload``."""
+    if isinstance(decorator, ast.Name):
+        return decorator.id == "overload"
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr == "overload"
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _union_members(annotation: str) -> tuple[str, ...]:
+    """
+    Return the members of a top-level ``X | Y`` union annotation.
+
+    Unions nested inside subscripts, e.g. ``Callable[[int | str], None]``, are
+    not split.
+    """
+    try:
+        node = ast.parse(annotation, mode="eval").body
+    except SyntaxError:
+        return (annotation,)
+
+    members = []
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            pending.extend((node.right, node.left))
+        else:
+            members.append(ast.unparse(node))
+    return tuple(members)
+
+
+def _is_subtype(sub: str, sup: str) -> bool:
+    """
+    Check whether annotation ``sub`` is implicitly accepted by ``sup``.
+
+    >>> _is_subtype("int", "float")
+    True
+    >>> _is_subtype("BASETYPE", "TypeDesc | BASETYPE | str")
+    True
+    >>> _is_subtype("str", "Callable[[int | str | float], None]")
+    False
+    """
+    if sub == sup:
+        return True
+    if OVERLOAD_SUBTYPES.get(sub) == sup:
+        return True
+    # A member of a union is covered by the union itself
+    return sub in _union_members(sup)
+
+
+# (name, annotation, has_default, kind) per parameter, plus the return type
+OverloadSignature = tuple[list[tuple[str, str, bool, str]], str]
+
+
+def _overload_signature(func: ast.FunctionDef) -> OverloadSignature:
+    """Extract comparable (name, annotation, has_default, kind) args and return type."""
+    args = func.args
+    positional = args.posonlyargs + args.args
+    n_defaults = len(args.defaults)
+    params = []
+    for index, arg in enumerate(positional):
+        annotation = ""
+        if arg.annotation is not None:
+            annotation = ast.unparse(arg.annotation)
+        has_default = index >= len(positional) - n_defaults
+        kind = "posonly" if index < len(args.posonlyargs) else "regular"
+        params.append((arg.arg, annotation, has_default, kind))
+
+    # Keyword-only and variadic args are compared verbatim
+    extras = ast.dump(
+        ast.arguments(
+            posonlyargs=[],
+            args=[],
+            vararg=args.vararg,
+            kwonlyargs=args.kwonlyargs,
+            kw_defaults=args.kw_defaults,
+            kwarg=args.kwarg,
+            defaults=[],
+        )
+    )
+    params.append(("", extras, False, ""))
+
+    returns = ast.unparse(func.returns) if func.returns is not None else ""
+    return params, returns
+
+
+def _is_redundant_overload(sig: OverloadSignature, other: OverloadSignature) -> bool:
+    """Check whether ``other`` accepts strictly more than ``sig`` with the same result."""
+    params, returns = sig
+    other_params, other_returns = other
+
+    if returns != other_returns or len(params) != len(other_params):
+        return False
+
+    strict = False
+    for (name, annotation, default, kind), other_param in zip(params, other_params):
+        other_name, other_annotation, other_default, other_kind = other_param
+        if name != other_name or default != other_default:
+            return False
+        # A positional-only parameter does not accept the keyword form
+        if kind == "regular" and other_kind == "posonly":
+            return False
+        if not _is_subtype(annotation, other_annotation):
+            return False
+        if annotation != other_annotation:
+            strict = True
+    return strict
+
+
+def fix_overload_conflicts(lines: list[str]) -> Iterator[str]:
     """
     Fix overlapping overload issues in generated stubs.
 
@@ -195,59 +222,152 @@ def fix_overload_conflicts(content: str) -> str:
     1. int is a subtype of float, so separate overloads conflict
     2. Union types that already include subtypes make separate overloads redundant
 
-    Solution: Remove redundant overloads.
+    Solution: Group overloads by (enclosing class, name) and remove every
+    overload that is covered by a more general sibling (see OVERLOAD_SUBTYPES).
     """
-    lines = content.split("\n")
-    fixed_lines = []
-    skip_next = False
+    tree = ast.parse("".join(lines))
+
+    # (class qualname, function name) -> overloads, in a single walk of the tree
+    groups: dict[tuple[str, str], list[ast.FunctionDef]] = {}
+    scopes: list[tuple[str, list[ast.stmt]]] = [("", tree.body)]
+    while scopes:
+        qualname, body = scopes.pop()
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                scopes.append((f"{qualname}.{node.name}".lstrip("."), node.body))
+            elif isinstance(node, ast.FunctionDef) and _is_overload(node):
+                groups.setdefault((qualname, node.name), []).append(node)
+
+    # Source lines (0-based, inclusive range) of the overloads to drop
+    dropped: set[int] = set()
+    for overloads in groups.values():
+        signatures = [_overload_signature(func) for func in overloads]
+        kept = []
+        for func, sig in zip(overloads, signatures):
+            if any(
+                other is not sig and _is_redundant_overload(sig, other)
+                for other in signatures
+            ):
+                first = min(d.lineno for d in func.decorator_list)
+                dropped.update(range(first - 1, func.end_lineno or func.lineno))
+            else:
+                kept.append(func)
+
+        # A single @overload is rejected by type checkers, make it a plain def
+        if len(kept) == 1 and len(overloads) > 1:
+            for decorator in kept[0].decorator_list:
+                if _is_overload_decorator(decorator):
+                    end = decorator.end_lineno or decorator.lineno
+                    dropped.update(range(decorator.lineno - 1, end))
+
+    if not dropped:
+        yield from lines
+        return
 
-    for i in range(len(lines)):
-        if skip_next:
-            skip_next = False
-            continue
+    for i, line in enumerate(lines):
+        if i not in dropped:
+            yield line
 
-        line = lines[i]
 
-        # Check for problematic overload patterns
-        if i + 1 < len(lines) and "@overload" in line:
-            next_line = lines[i + 1]
+def _needs_buffer_import(lines: list[str]) -> bool:
+    """Check in a single pass if Buffer is used without being imported."""
+    uses_buffer = False
+    for line in lines:
+        if "Buffer" in line:
+            if "from typing_extensions import Buffer" in line:
+                return False
+            uses_buffer = True
+    return uses_buffer
 
-            # Pattern 1: int overload when float exists
-            if "arg1: int" in next_line and any(
-                [
-                    "def attribute(" in next_line,
-                    "def __init__(" in next_line and "arg1: int" in next_line,
-                ]
-            ):
-                # Look ahead to see if there's a float version
-                has_float_version = False
-                for j in range(max(0, i - 4), min(len(lines), i + 6)):
-                    if j != i + 1 and "arg1: float" in lines[j]:
-                        has_float_version = True
-                        break
-
-                if has_float_version:
-                    skip_next = True
-                    continue
-
-            # Pattern 2: TypeDesc class __init__ with redundant overloads
-            # Skip standalone BASETYPE and str overloads when Union exists
-            if (
-                "def __init__(self, arg0: BASETYPE, /)" in next_line
-                or "def __init__(self, arg0: str, /)" in next_line
-            ):
-                # Check if there's a union type that includes this nearby
-                for j in range(max(0, i - 10), min(len(lines), i + 10)):
-                    if j != i + 1 and "arg0: TypeDesc | BASETYPE | str" in lines[j]:
-                        skip_next = True
-                        break
 
-                if skip_next:
-                    continue
+def apply_all_fixes(lines: list[str], module_name: str) -> Iterator[str]:
+    """
+    Apply every stub fix to the generated lines in a single streaming pass.
+
+    Args:
+        lines: Lines of the generated stub, with their line endings
+        module_name: Name of the module the stub was generated for
+
+    Returns:
+        Iterator over the fixed lines, header comment included
+    """
+    yield f"# Auto-generated stubs for {module_name}\n"
+    yield "# Generated with generate_stubs.py\n"
+    yield "\n"
+
+    fixed_lines: Iterable[str] = lines
+
+    # Fix overload conflicts for OpenImageIO
+    if module_name == "OpenImageIO":
+        fixed_lines = fix_overload_conflicts(lines)
+
+    # Add typing_extensions import if needed and not present
+    if _needs_buffer_import(lines):
+        fixed_lines = add_buffer_import(fixed_lines)
+
+    # Fix Exception cyclic definition for PyOpenColorIO
+    if module_name == "PyOpenColorIO":
+        fixed_lines = fix_pyopencolorio_exceptions(fixed_lines)
+
+    yield from fixed_lines
+
+
+def _stub_cache_path(module_name: str, out_path: Path) -> Path:
+    """Return the cache file path, kept outside the packaged stub directory."""
+    return out_path / f".{module_name}.stubcache.json"
+
+
+def _stub_cache_key(module_name: str) -> str:
+    """
+    Hash everything the generated stubs depend on.
+
+    This covers the installed module (version, mtime and size of its Python
+    files and compiled extensions), the mypy and stubgenlib versions, and the
+    sources of this script and of stubgen_generators.py, which hold the stub
+    fixes and the signature overrides.
+    """
+    module = importlib.import_module(module_name)
+    module_dir = Path(module.__file__ or "").parent
+
+    digest = hashlib.sha256()
+    digest.update(getattr(module, "__version__", "").encode())
+    # The stubs come from inspecting the extension, not only the __init__ wrapper
+    module_files = sorted(
+        path
+        for pattern in ("*.py", "*.so", "*.pyd")
+        for path in module_dir.glob(pattern)
+    )
+    for module_file in module_files:
+        stat = module_file.stat()
+        digest.update(f"{module_file}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    for package in ("mypy", "stubgenlib"):
+        digest.update(f"{package}=={importlib.metadata.version(package)}".encode())
+    script_path = Path(__file__)
+    digest.update(script_path.read_bytes())
+    digest.update(script_path.with_name("stubgen_generators.py").read_bytes())
+    return digest.hexdigest()
+
+
+def _read_stub_cache(module_name: str, out_path: Path, key: str) -> Optional[Path]:
+    """Return the previously generated stub if it is still up to date."""
+    cache_path = _stub_cache_path(module_name, out_path)
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
 
-        fixed_lines.append(line)
+    stub_path = out_path / module_name / cache.get("stub", "")
+    if cache.get("key") != key or not stub_path.is_file():
+        return None
+    return stub_path
 
-    return "\n".join(fixed_lines)
+
+def _write_stub_cache(
+    module_name: str, out_path: Path, key: str, stub_path: Path
+) -> None:
+    """Record the cache key of a freshly generated stub."""
+    cache_path = _stub_cache_path(module_name, out_path)
+    cache_path.write_text(json.dumps({"key": key, "stub": stub_path.name}))
 
 
 def generate_stubs_for_module(
@@ -255,6 +375,7 @@ def generate_stubs_for_module(
     out_path: Path,
     rename_to_init: bool = True,
     cleanup_files: Optional[list[str]] = None,
+    force: bool = False,
 ) -> Path:
     """
     Generate stubs for a specific module.
@@ -264,19 +385,31 @@ def generate_stubs_for_module(
         out_path: Output directory for stubs
         rename_to_init: Whether to rename the main stub file to __init__.pyi
         cleanup_files: List of files to remove after generation
+        force: Regenerate the stubs even if the cached ones are up to date
 
     Returns:
         Path to the generated stub file
     """
     print(f"\nGenerating stubs for {module_name}...")
 
-    # Clean up existing stub directory if it exists
+    # Skip generation when neither the module nor this script changed
+    cache_key = _stub_cache_key(module_name)
+    if not force:
+        cached_stub = _read_stub_cache(module_name, out_path, cache_key)
+        if cached_stub is not None:
+            print(f"Stubs for {module_name} are up to date: {cached_stub}")
+            return cached_stub
+
+    # Generate into a scratch directory, existing stubs are only replaced
+    # once the new ones are complete
     module_dir = out_path / module_name
-    if module_dir.exists():
-        import shutil
+    tmp_root = out_path / f".{module_name}.tmp"
+    shutil.rmtree(tmp_root, ignore_errors=True)
 
-        print(f"Cleaning existing stubs in {module_dir}")
-        shutil.rmtree(module_dir)
+    # Only import mypy and stubgenlib once we know stubs must be generated
+    import mypy.stubgen
+    import mypy.stubgenc
+    from stubgen_generators import CustomInspectionStubGenerator
 
     # Patch mypy's stub generator for this module
     old_generator = mypy.stubgenc.InspectionStubGenerator
@@ -288,82 +421,94 @@ def generate_stubs_for_module(
     mypy.stubgenc.InspectionStubGenerator = CustomInspectionStubGenerator  # type: ignore
 
     try:
-        # Import the module to ensure it's available
-        __import__(module_name)
-
-        # Run stubgen
-        sys.argv[1:] = ["-p", module_name, "-o", str(out_path), "--inspect-mode"]
-        mypy.stubgen.main()
+        # Run stubgen, equivalent to `stubgen -p <module> -o <tmp> --inspect-mode`
+        # without going through its command line parsing
+        tmp_root.mkdir(parents=True, exist_ok=True)
+        options = mypy.stubgen.Options(
+            pyversion=sys.version_info[:2],
+            no_import=False,
+            inspect=True,
+            doc_dir="",
+            search_path=[""],
+            interpreter=sys.executable,
+            parse_only=False,
+            ignore_errors=False,
+            include_private=False,
+            output_dir=str(tmp_root),
+            modules=[],
+            packages=[module_name],
+            files=[],
+            verbose=False,
+            quiet=False,
+            export_less=False,
+            include_docstrings=False,
+        )
+        mypy.stubgen.generate_stubs(options)
 
         # Find the generated stub file
-        module_dir = out_path / module_name
-        source_path = module_dir / f"{module_name}.pyi"
+        tmp_dir = tmp_root / module_name
+        source_path = tmp_dir / f"{module_name}.pyi"
 
         if not source_path.exists():
             # Sometimes the file might be named differently
-            pyi_files = list(module_dir.glob("*.pyi"))
+            pyi_files = list(tmp_dir.glob("*.pyi"))
             if pyi_files and pyi_files[0].name != "__init__.pyi":
                 source_path = pyi_files[0]
 
         if not source_path.exists():
             raise FileNotFoundError(f"Stub generation failed for {module_name}")
 
+        # Add header comment and fix the generated stub in one pass
+        with source_path.open("r") as f:
+            lines = f.readlines()
+        with source_path.open("w") as f:
+            f.writelines(apply_all_fixes(lines, module_name))
+
+        # Clean up unwanted files, from this run and from previous ones
+        for filename in cleanup_files or []:
+            (tmp_dir / filename).unlink(missing_ok=True)
+            (module_dir / filename).unlink(missing_ok=True)
+
         # Rename to __init__.pyi if requested
-        if rename_to_init and source_path.name != "__init__.pyi":
+        if rename_to_init:
             dest_path = module_dir / "__init__.pyi"
-            print(f"Renaming {source_path} to {dest_path}")
-            # On Windows, remove destination if it exists
-            if dest_path.exists():
-                dest_path.unlink()
-            source_path.rename(dest_path)
         else:
-            dest_path = source_path
-
-        # Add header comment
-        content = dest_path.read_text()
-        content = (
-            f"# Auto-generated stubs for {module_name}\n"
-            f"# Generated with generate_stubs.py\n\n"
-        ) + content
-
-        # Add typing_extensions import if needed and not present
-        if (
-            "Buffer" in content
-            and "from typing_extensions import Buffer" not in content
-        ):
-            lines = content.split("\n")
-            # Find where to insert the import (after other imports)
-            import_index = 0
-            for i, line in enumerate(lines):
-                if line.startswith("import ") or line.startswith("from "):
-                    import_index = i + 1
-                elif import_index > 0 and line and not line.startswith(" "):
-                    break
-            lines.insert(import_index, "from typing_extensions import Buffer")
-            content = "\n".join(lines)
-
-        # Fix overload conflicts for OpenImageIO
-        if module_name == "OpenImageIO":
-            content = fix_overload_conflicts(content)
-
-        # Fix Exception cyclic definition for PyOpenColorIO
-        if module_name == "PyOpenColorIO":
-            content = fix_pyopencolorio_exceptions(content)
-
-        dest_path.write_text(content)
-
-        # Clean up unwanted files
-        if cleanup_files:
-            for filename in cleanup_files:
-                file_path = module_dir / filename
-                if file_path.exists():
-                    print(f"Removing {file_path}")
-                    file_path.unlink()
+            dest_path = module_dir / source_path.name
+
+        # Atomically replace the previous stubs with the new ones
+        module_dir.mkdir(parents=True, exist_ok=True)
+        current_stubs = set()
+        for stub_path in tmp_dir.glob("*.pyi"):
+            if stub_path == source_path:
+                target_path = dest_path
+            elif stub_path.name == dest_path.name:
+                # Superseded by the renamed main stub
+                continue
+            else:
+                target_path = module_dir / stub_path.name
+            current_stubs.add(target_path)
+            # Leave identical stubs untouched to keep their mtime
+            if target_path.exists() and filecmp.cmp(
+                stub_path, target_path, shallow=False
+            ):
+                print(f"Unchanged {target_path}")
+                continue
+            print(f"Writing {target_path}")
+            os.replace(stub_path, target_path)
+
+        # Remove stubs from previous runs that this generation no longer produces
+        for stale_path in module_dir.glob("*.pyi"):
+            if stale_path not in current_stubs:
+                print(f"Removing {stale_path}")
+                stale_path.unlink()
 
         # Create py.typed marker file
         py_typed_path = module_dir / "py.typed"
-        py_typed_path.touch()
-        print(f"Created {py_typed_path}")
+        if not py_typed_path.exists():
+            py_typed_path.touch()
+            print(f"Created {py_typed_path}")
+
+        _write_stub_cache(module_name, out_path, cache_key, dest_path)
 
         return dest_path
 
@@ -371,6 +516,7 @@ def generate_stubs_for_module(
         # Restore original generator
         mypy.stubgen.InspectionStubGenerator = old_generator  # type: ignore
         mypy.stubgenc.InspectionStubGenerator = old_generator  # type: ignore
+        shutil.rmtree(tmp_root, ignore_errors=True)
 
 
 def main() -> None:
@@ -389,6 +535,11 @@ def main() -> None:
     parser.add_argument(
         "--ocio-only", action="store_true", help="Only generate stubs for PyOpenColorIO"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate stubs even if they are up to date",
+    )
 
     args = parser.parse_args()
     out_path = Path(args.out_path)
@@ -398,33 +549,38 @@ def main() -> None:
 
     success = True
 
-    # Generate OpenImageIO stubs
+    modules = []
     if not args.ocio_only:
-        try:
-            oiio_stub = generate_stubs_for_module(
-                "OpenImageIO",
-                out_path,
-                rename_to_init=True,
-                cleanup_files=["_tool_wrapper.pyi"],
-            )
-            print(f"✓ Generated OpenImageIO stubs: {oiio_stub}")
-        except Exception as e:
-            print(f"✗ Failed to generate OpenImageIO stubs: {e}")
-            success = False
-
-    # Generate PyOpenColorIO stubs
+        modules.append("OpenImageIO")
     if not args.oiio_only:
-        try:
-            ocio_stub = generate_stubs_for_module(
-                "PyOpenColorIO",
+        modules.append("PyOpenColorIO")
+
+    # Modules are independent, generate them concurrently in separate processes.
+    # "spawn" behaves the same on every platform and gives each worker its own
+    # copy of the patched mypy generator.
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=max(len(modules), 1), mp_context=mp_context
+    ) as executor:
+        futures = {
+            executor.submit(
+                generate_stubs_for_module,
+                module_name,
                 out_path,
                 rename_to_init=True,
                 cleanup_files=["_tool_wrapper.pyi"],
-            )
-            print(f"✓ Generated PyOpenColorIO stubs: {ocio_stub}")
-        except Exception as e:
-            print(f"✗ Failed to generate PyOpenColorIO stubs: {e}")
-            success = False
+                force=args.force,
+            ): module_name
+            for module_name in modules
+        }
+        for future in as_completed(futures):
+            module_name = futures[future]
+            try:
+                stub = future.result()
+                print(f"✓ Generated {module_name} stubs: {stub}")
+            except Exception as e:
+                print(f"✗ Failed to generate {module_name} stubs: {e}")
+                success = False
 
     if success:
         print("\n✓ Stub generation completed successfully!")
@@ -7,7 +7,6 @@ release and test modes.
 
 import argparse
 import shutil
-import subprocess
 import sys
 import re
 from pathlib import Path
@@ -17,25 +16,33 @@ here = Path(__file__).parent.resolve()
 # GitHub repository base URL for images
 GITHUB_RAW_URL = "https://raw.githubusercontent.com/pypoulp/types-oiio-python/main/"
 
+# Markdown image links pointing at the local img/ folder
+_IMG_URL_RE = re.compile(rb'!\[([^\]]*)\]\(img/([^)]+)\)')
+_IMG_URL_REPL = rb'![\1](' + GITHUB_RAW_URL.encode() + rb'img/\2)'
+
 
 def replace_image_urls_for_pypi():
     """
     Replace local image URLs with GitHub URLs in README.md for PyPI.
-    Returns the original content for restoration.
+    Returns the original content for restoration, or None if README.md
+    was left untouched.
     """
     readme_path = here / "README.md"
-    original_content = readme_path.read_text(encoding='utf-8')
+    # Work on the raw UTF-8 bytes to avoid decoding/re-encoding the file
+    original_content = readme_path.read_bytes()
+
+    # Cheap literal check before running the regex
+    if b"](img/" not in original_content:
+        return None
     
     # Replace relative image paths with GitHub raw URLs
-    modified_content = re.sub(
-        r'!\[([^\]]*)\]\(img/([^)]+)\)',
-        rf'![\1]({GITHUB_RAW_URL}img/\2)',
-        original_content
-    )
+    modified_content, n_replaced = _IMG_URL_RE.subn(_IMG_URL_REPL, original_content)
     
-    if modified_content != original_content:
-        readme_path.write_text(modified_content, encoding='utf-8')
-        print("✓ Replaced local image URLs with GitHub URLs in README.md")
+    if not n_replaced:
+        return None
+
+    readme_path.write_bytes(modified_content)
+    print("✓ Replaced local image URLs with GitHub URLs in README.md")
     
     return original_content
 
@@ -43,7 +50,7 @@ def replace_image_urls_for_pypi():
 def restore_readme(original_content):
     """Restore the original README.md content."""
     readme_path = here / "README.md"
-    readme_path.write_text(original_content, encoding='utf-8')
+    readme_path.write_bytes(original_content)
     print("✓ Restored original README.md")
 
 
@@ -57,13 +64,17 @@ def cleanup():
         shutil.rmtree(build_dir)
 
 
-def run_command(command):
-    """Run a shell command and handle errors gracefully."""
+def build_package():
+    """Build the sdist and wheel into the dist folder."""
+    # Imported here so the script starts without paying for build's import
+    from build.__main__ import main as build_main
+
     try:
-        subprocess.run(command, check=True, shell=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error while running command: {e.cmd}")
-        sys.exit(1)
+        build_main([str(here), "--outdir", str(here / "dist")])
+    except SystemExit as e:
+        # build reports failures by exiting, turn them into a regular error
+        if e.code:
+            raise RuntimeError(f"build exited with status {e.code}") from e
 
 
 def publish_to_pypi(repository_url):
@@ -95,7 +106,13 @@ def publish_to_pypi(repository_url):
         print("No files to publish.")
         sys.exit(0)
 
-    run_command(f"twine upload --repository {repository_url} dist/*")
+    from twine.cli import dispatch as twine_dispatch
+
+    # Run twine in-process rather than spawning a new interpreter, going through
+    # its CLI dispatcher so that upload progress and server errors are logged
+    twine_dispatch(
+        ["upload", "--repository", repository_url, str(here / "dist" / "*")]
+    )
 
 
 def main():
@@ -134,8 +151,8 @@ def main():
         # Replace image URLs for PyPI
         original_readme = replace_image_urls_for_pypi()
         
-        # Build the package
-        subprocess.run(["python", "-m", "build"], check=True)
+        # Build the package in-process rather than spawning a new interpreter
+        build_package()
         
         # Publish to PyPI
         publish_to_pypi(repository_url)
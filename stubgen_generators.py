@@ -0,0 +1,232 @@
+"""
+Signature generators used by generate_stubs.py to customize mypy's stubgen.
+
+Kept apart from the script so that mypy and stubgenlib, which are slow to
+import, are only loaded when stubs actually need to be generated.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import functools
+import re
+from typing import Any, Callable, Optional
+
+import mypy.stubgen
+import mypy.stubgenc
+from mypy.stubgenc import DocstringSignatureGenerator, SignatureGenerator
+from stubgenlib.siggen import AdvancedSigMatcher, AdvancedSignatureGenerator
+from stubgenlib.utils import add_positional_only_args
+
+PY_TO_STDVECTOR_ARG = "float | typing.Iterable[float]"
+
+# Shared fallback used by every signature generator, it holds no per-module state
+DOCSTRING_SIG_GEN = DocstringSignatureGenerator()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_glob(pattern: str) -> Callable[[str], Optional[re.Match[str]]]:
+    """Compile a fnmatch glob once, identical globs share the same matcher."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+class CachedSigMatcher(AdvancedSigMatcher):
+    """
+    AdvancedSigMatcher that memoizes override lookups.
+
+    stubgen queries the matcher for every function, overload and argument it
+    inspects, and each query scans all the override patterns. The result only
+    depends on the queried names/types and on the (immutable) override dict,
+    so it is cached. The name globs of the override keys are also compiled
+    once instead of going through fnmatch on every comparison.
+    """
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._lookup_cache: dict[tuple[Any, ...], Any] = {}
+        self._compiled_items: dict[int, list[tuple[Any, ...]]] = {}
+
+    def _compile_items(
+        self, items: dict[Any, Any], n_globs: int
+    ) -> list[tuple[Any, ...]]:
+        """
+        Return the override dict as (*name_matchers, *rest_of_key, value) tuples.
+
+        Only the first ``n_globs`` members of the key are name globs, type
+        patterns are left to ``_type_match`` as they may be regular expressions.
+        """
+        compiled = self._compiled_items.get(id(items))
+        if compiled is None:
+            compiled = []
+            for key, value in items.items():
+                patterns = (key,) if isinstance(key, str) else key
+                matchers = tuple(_compile_glob(p) for p in patterns[:n_globs])
+                compiled.append((*matchers, *patterns[n_globs:], value))
+            self._compiled_items[id(items)] = compiled
+        return compiled
+
+    def find_func_match(self, fullname: str, items: dict[str, Any]) -> Any:
+        key = ("func", id(items), fullname)
+        if key not in self._lookup_cache:
+            self._lookup_cache[key] = next(
+                (
+                    value
+                    for name_match, value in self._compile_items(items, 1)
+                    if name_match(fullname)
+                ),
+                None,
+            )
+        return self._lookup_cache[key]
+
+    def find_arg_match(
+        self,
+        fullname: str,
+        arg_name: str,
+        arg_type: Optional[str],
+        items: dict[Any, Any],
+    ) -> Any:
+        key = ("arg", id(items), fullname, arg_name, arg_type)
+        if key not in self._lookup_cache:
+            result = None
+            for name_match, arg_match, type_match, value in self._compile_items(
+                items, 2
+            ):
+                if name_match(fullname) and arg_match(arg_name):
+                    result = self._type_match(type_match, value, arg_type)
+                    if result is not None:
+                        break
+            self._lookup_cache[key] = result
+        return self._lookup_cache[key]
+
+    def find_result_match(
+        self, fullname: str, ret_type: Optional[str], items: dict[Any, Any]
+    ) -> Any:
+        key = ("result", id(items), fullname, ret_type)
+        if key not in self._lookup_cache:
+            result = None
+            for name_match, type_match, value in self._compile_items(items, 1):
+                if name_match(fullname):
+                    result = self._type_match(type_match, value, ret_type)
+                    if result is not None:
+                        break
+            self._lookup_cache[key] = result
+        return self._lookup_cache[key]
+
+
+class OIIOSignatureGenerator(AdvancedSignatureGenerator):
+    """Signature generator specifically for OpenImageIO."""
+
+    sig_matcher = CachedSigMatcher(
+        signature_overrides={
+            # signatures for these special methods include many inaccurate overloads
+            "*.__ne__": "(self, other: object) -> bool",
+            "*.__eq__": "(self, other: object) -> bool",
+        },
+        arg_type_overrides={
+            # FIXME: Buffer may in fact be more accurate here
+            ("*", "*", "Buffer"): "numpy.ndarray",
+            # these use py_to_stdvector util
+            ("*.ImageBufAlgo.*", "min", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "max", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "black", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "white", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "sthresh", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "scontrast", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "white_balance", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "values", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "top", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "bottom", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "topleft", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "topright", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "bottomleft", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "bottomright", "object"): PY_TO_STDVECTOR_ARG,
+            ("*.ImageBufAlgo.*", "color", "object"): PY_TO_STDVECTOR_ARG,
+            # BASETYPE & str are implicitly converible to TypeDesc
+            ("*", "*", "*.TypeDesc"): "Union[TypeDesc, BASETYPE, str]",
+            # list is not strictly required
+            (
+                "*.ImageOutput.open",
+                "specs",
+                "list[ImageSpec]",
+            ): "typing.Iterable[ImageSpec]",
+        },
+        result_type_overrides={
+            # FIXME: is there a way to use std::optional for these?
+            ("*.ImageOutput.create", "object"): "ImageOutput | None",
+            ("*.ImageOutput.open", "object"): "ImageOutput | None",
+            ("*.ImageInput.create", "object"): "ImageInput | None",
+            ("*.ImageInput.open", "object"): "ImageInput | None",
+            # if you return an uninitialized unique_ptr to pybind11 it will convert to `None`
+            ("*.ImageInput.read_native_deep_*", "DeepData"): "DeepData | None",
+            # pybind11 has numpy support
+            ("*.ImageInput.read_*", "object"): "numpy.ndarray | None",
+            ("*", "Buffer"): "numpy.ndarray",
+            ("*.get_pixels", "object"): "numpy.ndarray | None",
+            # For results, `object` is too restrictive
+            ("*.getattribute", "object"): "typing.Any",
+            ("*.ImageSpec.get", "object"): "typing.Any",
+            ("*.ImageBufAlgo.histogram", "*"): "tuple[int, ...]",
+            ("*.ImageBufAlgo.isConstantColor", "*"): "tuple[float, ...] | None",
+            ("*.ImageBufAlgo.color_range_check", "*"): "tuple[int, ...] | None",
+            ("*.TextureSystem.imagespec", "object"): "ImageSpec | None",
+            ("*.TextureSystem.texture", "tuple"): "tuple[float, ...]",
+            ("*.TextureSystem.texture3d", "tuple"): "tuple[float, ...]",
+            ("*.TextureSystem.environment", "tuple"): "tuple[float, ...]",
+            ("*.ImageBuf.getpixel", "tuple"): "tuple[float, ...]",
+            ("*.ImageBuf.interppixel*", "tuple"): "tuple[float, ...]",
+            ("*.ImageSpec.get_channelformats", "tuple"): "tuple[TypeDesc, ...]",
+        },
+        property_type_overrides={
+            ("*.ParamValue.value", "object"): "typing.Any",
+        },
+    )
+
+    def process_sig(
+        self, ctx: mypy.stubgen.FunctionContext, sig: mypy.stubgen.FunctionSig
+    ) -> mypy.stubgen.FunctionSig:
+        """Process signature with OIIO-specific handling."""
+        return add_positional_only_args(ctx, super().process_sig(ctx, sig))
+
+
+class OCIOSignatureGenerator(AdvancedSignatureGenerator):
+    """Signature generator specifically for PyOpenColorIO."""
+
+    sig_matcher = CachedSigMatcher(
+        signature_overrides={
+            # Special methods
+            "*.__ne__": "(self, other: object) -> bool",
+            "*.__eq__": "(self, other: object) -> bool",
+        },
+        arg_type_overrides={
+            # Add PyOpenColorIO-specific type overrides here as needed
+        },
+        result_type_overrides={
+            # Add PyOpenColorIO-specific result type overrides here as needed
+        },
+    )
+
+    def process_sig(
+        self, ctx: mypy.stubgen.FunctionContext, sig: mypy.stubgen.FunctionSig
+    ) -> mypy.stubgen.FunctionSig:
+        """Process signature with OCIO-specific handling."""
+        return add_positional_only_args(ctx, super().process_sig(ctx, sig))
+
+
+class CustomInspectionStubGenerator(mypy.stubgenc.InspectionStubGenerator):
+    """Custom stub generator that uses our signature generators."""
+
+    module_name: str = ""
+
+    def get_sig_generators(self) -> list[SignatureGenerator]:
+        return list(_get_sig_generators(self.module_name))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_sig_generators(module_name: str) -> tuple[SignatureGenerator, ...]:
+    """Build the signature generators for a module once and reuse them."""
+    if "OpenImageIO" in module_name:
+        return (OIIOSignatureGenerator(fallback_sig_gen=DOCSTRING_SIG_GEN),)
+    elif "PyOpenColorIO" in module_name:
+        return (OCIOSignatureGenerator(fallback_sig_gen=DOCSTRING_SIG_GEN),)
+    else:
+        return (DOCSTRING_SIG_GEN,)
@@ -1,4 +1,6 @@
 echo "OpenImageIO:"
 stubtest OpenImageIO --allowlist oiio-mypy-baseline.txt
 echo "PyOpenColorIO:"
-stubtest PyOpenColorIO --allowlist ocio-mypy-baseline.txt
\ No newline at end of file
+stubtest PyOpenColorIO --allowlist ocio-mypy-baseline.txt
+echo "generate_stubs.py:"
+python -m doctest generate_stubs.py